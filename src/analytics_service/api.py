@@ -1,25 +1,67 @@
-import requests
+import httpx
+from functools import wraps
 from typing import Optional
 import logging
+import time
 
 # Configure logging
 logger = logging.getLogger("umami-client")
 
 
+def _ttl_cache(ttl: float, maxsize: int = 256):
+    """
+    Cache the results of an async UmamiClient method for ttl seconds.
+
+    Entries live in the instance's _caches, keyed on the call arguments, so they
+    go away with the client. Expired entries are dropped when looked up or when
+    the cache fills. Failed requests (None results) are not cached. Cached
+    responses are shared between callers, so they must not be mutated.
+    """
+
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(self, *args, **kwargs):
+            cache = self._caches.setdefault(func.__name__, {})
+            key = (args, tuple(sorted(kwargs.items())))
+            hit = cache.get(key)
+            if hit is not None:
+                if hit[0] > time.monotonic():
+                    return hit[1]
+                del cache[key]
+            data = await func(self, *args, **kwargs)
+            if data is not None:
+                if len(cache) >= maxsize:
+                    now = time.monotonic()
+                    for stale in [k for k, (exp, _) in cache.items() if exp <= now]:
+                        del cache[stale]
+                    if len(cache) >= maxsize:
+                        cache.pop(next(iter(cache)))
+                cache[key] = (time.monotonic() + ttl, data)
+            return data
+
+        return wrapper
+
+    return decorator
+
+
 class UmamiClient:
-    def __init__(self, base_url: str):
+    def __init__(self, base_url: str, client: Optional[httpx.AsyncClient] = None):
         """
         Initialize the UmamiClient with the base URL of the Umami Analytics API.
+        An existing httpx.AsyncClient can be passed in to share its connection pool.
         """
         self.base_url = base_url.rstrip("/")
-        self.session = requests.Session()
+        self.client = client or httpx.AsyncClient()
+        self.headers: dict[str, str] = {}
         self.token = None
+        # Per-method response caches filled by _ttl_cache
+        self._caches: dict[str, dict] = {}
 
     def set_api_token(self, token: str) -> None:
         self.token = token
-        self.session.headers.update({"x-umami-api-key": f"{self.token}"})
+        self.headers["x-umami-api-key"] = f"{self.token}"
 
-    def login(self, username: str, password: str) -> bool:
+    async def login(self, username: str, password: str) -> bool:
         """
         Log in to the Umami API using the provided username and password.
         Returns True if login is successful, False otherwise.
@@ -29,19 +71,19 @@ class UmamiClient:
         headers = {"Content-Type": "application/json", "Accept": "application/json"}
 
         try:
-            response = self.session.post(login_url, headers=headers, json=payload)
+            response = await self.client.post(login_url, headers=headers, json=payload)
             response.raise_for_status()
             data = response.json()
             self.token = data.get("token")
             if self.token:
                 # Set the Authorization header for future requests
-                self.session.headers.update({"Authorization": f"Bearer {self.token}"})
+                self.headers["Authorization"] = f"Bearer {self.token}"
                 logger.debug("Login successful")
                 return True
             else:
                 logger.error("Login failed: Token not found in response.")
                 return False
-        except requests.exceptions.HTTPError as http_err:
+        except httpx.HTTPStatusError as http_err:
             logger.error(
                 f"HTTP error occurred during login: {http_err} - {response.text}"
             )
@@ -50,19 +92,22 @@ class UmamiClient:
             logger.error(f"An error occurred during login: {err}")
             return False
 
-    def get_websites(self, query: str = "", page_size: int = 150) -> Optional[dict]:
+    @_ttl_cache(ttl=60)
+    async def get_websites(
+        self, query: str = "", page_size: int = 150
+    ) -> Optional[dict]:
         """
         Retrieve a list of websites for a given team.
         """
         url = f"{self.base_url}/websites"
         params = {"query": query, "pageSize": page_size}
         try:
-            response = self.session.get(url, params=params)
+            response = await self.client.get(url, params=params, headers=self.headers)
             response.raise_for_status()
             data = response.json()
             logger.info(f"Retrieved {len(data.get('data', []))} websites.")
             return data
-        except requests.exceptions.HTTPError as http_err:
+        except httpx.HTTPStatusError as http_err:
             logger.error(
                 f"HTTP error occurred while fetching websites: {http_err} - {response.text}"
             )
@@ -71,7 +116,8 @@ class UmamiClient:
             logger.error(f"An error occurred while fetching websites: {err}")
             return None
 
-    def get_website_stats(
+    @_ttl_cache(ttl=60)
+    async def get_website_stats(
         self, website_id: str, start_at: int, end_at: int
     ) -> Optional[dict]:
         """
@@ -80,12 +126,12 @@ class UmamiClient:
         url = f"{self.base_url}/websites/{website_id}/stats"
         params = {"startAt": start_at, "endAt": end_at}
         try:
-            response = self.session.get(url, params=params)
+            response = await self.client.get(url, params=params, headers=self.headers)
             response.raise_for_status()
             data = response.json()
             logger.info(f"Retrieved stats for website {website_id}.")
             return data
-        except requests.exceptions.HTTPError as http_err:
+        except httpx.HTTPStatusError as http_err:
             logger.error(
                 f"HTTP error occurred while fetching website stats: {http_err} - {response.text}"
             )
@@ -94,7 +140,8 @@ class UmamiClient:
             logger.error(f"An error occurred while fetching website stats: {err}")
             return None
 
-    def get_website_metrics(
+    @_ttl_cache(ttl=60)
+    async def get_website_metrics(
         self, website_id: str, start_at: int, end_at: int, type: str
     ) -> Optional[dict]:
         """
@@ -103,12 +150,12 @@ class UmamiClient:
         url = f"{self.base_url}/websites/{website_id}/metrics"
         params = {"startAt": start_at, "endAt": end_at, "type": type}
         try:
-            response = self.session.get(url, params=params)
+            response = await self.client.get(url, params=params, headers=self.headers)
             response.raise_for_status()
             data = response.json()
             logger.info(f"Retrieved metrics for website {website_id}.")
             return data
-        except requests.exceptions.HTTPError as http_err:
+        except httpx.HTTPStatusError as http_err:
             logger.error(
                 f"HTTP error occurred while fetching website metrics: {http_err} - {response.text}"
             )
@@ -117,7 +164,8 @@ class UmamiClient:
             logger.error(f"An error occurred while fetching website metrics: {err}")
             return None
 
-    def get_events_where(
+    @_ttl_cache(ttl=60)
+    async def get_events_where(
         self,
         website_id: str,
         start_at: int,
@@ -155,15 +203,17 @@ class UmamiClient:
             "pageSize": page_size,
             "search": "",  # Assuming 'search' is optional and empty by default
         }
+        # Drop unset filters rather than sending them as empty values
+        params = {k: v for k, v in params.items() if v is not None}
         try:
-            response = self.session.get(url, params=params)
+            response = await self.client.get(url, params=params, headers=self.headers)
             response.raise_for_status()
             data = response.json()
             logger.info(
                 f"Retrieved events with query '{query}' for website {website_id}."
             )
             return data
-        except requests.exceptions.HTTPError as http_err:
+        except httpx.HTTPStatusError as http_err:
             logger.error(
                 f"HTTP error occurred while fetching events: {http_err} - {response.text}"
             )
@@ -172,7 +222,8 @@ class UmamiClient:
             logger.error(f"An error occurred while fetching events: {err}")
             return None
 
-    def get_user_activity(
+    @_ttl_cache(ttl=60)
+    async def get_user_activity(
         self, website_id: str, session_id: str, start_at: int, end_at: int
     ) -> Optional[dict]:
         """
@@ -190,12 +241,12 @@ class UmamiClient:
         url = f"{self.base_url}/websites/{website_id}/sessions/{session_id}/activity"
         params = {"startAt": start_at, "endAt": end_at}
         try:
-            response = self.session.get(url, params=params)
+            response = await self.client.get(url, params=params, headers=self.headers)
             response.raise_for_status()
             data = response.json()
             logger.info(f"Retrieved user activity for session {session_id}.")
             return data
-        except requests.exceptions.HTTPError as http_err:
+        except httpx.HTTPStatusError as http_err:
             logger.error(
                 f"HTTP error occurred while fetching user activity: {http_err} - {response.text}"
             )
@@ -204,7 +255,8 @@ class UmamiClient:
             logger.error(f"An error occurred while fetching user activity: {err}")
             return None
 
-    def get_pageview_series(
+    @_ttl_cache(ttl=60)
+    async def get_pageview_series(
         self, website_id: str, start_at: int, end_at: int, unit: str, timezone: str
     ) -> Optional[dict]:
         """
@@ -228,12 +280,12 @@ class UmamiClient:
             "timezone": timezone,
         }
         try:
-            response = self.session.get(url, params=params)
+            response = await self.client.get(url, params=params, headers=self.headers)
             response.raise_for_status()
             data = response.json()
             logger.info(f"Retrieved pageview series for website {website_id}.")
             return data
-        except requests.exceptions.HTTPError as http_err:
+        except httpx.HTTPStatusError as http_err:
             logger.error(
                 f"HTTP error occurred while fetching pageview series: {http_err} - {response.text}"
             )
@@ -242,7 +294,7 @@ class UmamiClient:
             logger.error(f"An error occurred while fetching pageview series: {err}")
             return None
 
-    def get_active(self, website_id: str) -> Optional[dict]:
+    async def get_active(self, website_id: str) -> Optional[dict]:
         """
         Retrieve active visitor data for a specific website.
 
@@ -257,12 +309,12 @@ class UmamiClient:
         url = f"{self.base_url}/websites/{website_id}/active"
 
         try:
-            response = self.session.get(url)
+            response = await self.client.get(url, headers=self.headers)
             response.raise_for_status()
             data = response.json()
             logger.info(f"Retrieved active visitor data for website {website_id}.")
             return data
-        except requests.exceptions.HTTPError as http_err:
+        except httpx.HTTPStatusError as http_err:
             logger.error(
                 f"HTTP error occurred while fetching active visitor data: {http_err} - {response.text}"
             )
@@ -1,10 +1,12 @@
 from contextlib import asynccontextmanager
+import asyncio
 import logging
 import os
-import json
+from typing import AsyncIterator
 
 from dotenv import load_dotenv
 import httpx
+import orjson
 from mcp.types import TextContent, PromptMessage
 from mcp.server.fastmcp import FastMCP
 
@@ -15,21 +17,86 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
 logger = logging.getLogger("umami_mcp_server")
 
-httpx_client = httpx.AsyncClient()
+
+async def _log_http_version(response: httpx.Response) -> None:
+    """Log the negotiated HTTP version of each Umami response at debug level."""
+    logger.debug(
+        "%s %s over %s", response.request.method, response.url, response.http_version
+    )
+
+
+# Connection pool size of the shared httpx client
+MAX_CONNECTIONS = 500
+
+# Shared client for every Umami request, sized for the concurrent fan-out in
+# _get_session_ids and get_tracking_data_batch. HTTP/2 lets that fan-out share
+# a single connection when the Umami host supports it. It lives as long as the
+# process: FastMCP runs lifespan once per session on the SSE and streamable
+# HTTP transports, so lifespan must not close it.
+httpx_client = httpx.AsyncClient(
+    http2=True,
+    limits=httpx.Limits(
+        max_connections=MAX_CONNECTIONS,
+        max_keepalive_connections=100,
+        keepalive_expiry=15.0,
+    ),
+    timeout=httpx.Timeout(30.0, connect=5.0),
+    headers={"user-agent": "umami-mcp/1.0"},
+    event_hooks={"response": [_log_http_version]},
+)
+
+
+async def _refresh_token_periodically(client: UmamiClient) -> None:
+    """
+    Log in again every TOKEN_REFRESH_INTERVAL seconds so the session token is
+    replaced before it expires. A failed refresh keeps the current token.
+
+    Args:
+        client (UmamiClient): The client whose token should be refreshed.
+    """
+    while True:
+        await asyncio.sleep(TOKEN_REFRESH_INTERVAL)
+        if not await client.login(API_USERNAME, API_PASSWORD):
+            logger.warning("Token refresh failed, keeping the current token")
+
+
+# Background re-login task. It is held here so it isn't garbage collected and
+# outlives the session that started it.
+_refresh_task: asyncio.Task | None = None
+_auth_lock = asyncio.Lock()
+
+
+async def _authenticate() -> None:
+    """
+    Authenticate the shared client once per process. The first session sets the
+    API key or logs in and starts the token refresh; later sessions reuse it.
+
+    Raises:
+        RuntimeError: If logging in with the username and password fails.
+    """
+    global _refresh_task
+    async with _auth_lock:
+        if client.token:
+            return
+        if API_KEY:
+            client.set_api_token(API_KEY)
+        elif await client.login(API_USERNAME, API_PASSWORD):
+            _refresh_task = asyncio.create_task(_refresh_token_periodically(client))
+        else:
+            raise RuntimeError("Failed to login to Umami API")
 
 
 @asynccontextmanager
 async def lifespan(app: FastMCP):
     """
-    Context manager to ensure the shared httpx client is closed when the server stops.
+    Context manager run for each session that makes sure the shared client is
+    authenticated with the Umami API before any tool is called.
 
     Args:
         app (FastMCP): The MCP server application instance.
     """
-    try:
-        yield
-    finally:
-        await httpx_client.aclose()
+    await _authenticate()
+    yield
 
 
 mcp = FastMCP("umami", lifespan=lifespan)
@@ -42,18 +109,241 @@ TEAM_ID = os.getenv("UMAMI_TEAM_ID")
 
 API_KEY = os.getenv("UMAMI_API_KEY")
 
-client = UmamiClient(API_BASE_URL)
+# Seconds between background re-logins when authenticating with a password
+TOKEN_REFRESH_INTERVAL = float(os.getenv("UMAMI_TOKEN_REFRESH_INTERVAL") or 3600)
 
-if API_KEY:
-    client.set_api_token(API_KEY)
-elif API_USERNAME and API_PASSWORD and TEAM_ID:
-    if not client.login(API_USERNAME, API_PASSWORD):
-        raise RuntimeError("Failed to login to Umami API")
-else:
+if not API_KEY and not (API_USERNAME and API_PASSWORD and TEAM_ID):
     raise ValueError("Missing required environment variables")
 
+client = UmamiClient(API_BASE_URL, client=httpx_client)
+
+# Caps on concurrently executing tool calls, so bursts queue here instead of
+# exhausting the connection pool. get_active_visitors hits a cheaper endpoint.
+MAX_INFLIGHT = int(os.getenv("UMAMI_MAX_INFLIGHT", "32"))
+MAX_ACTIVE_INFLIGHT = int(os.getenv("UMAMI_MAX_ACTIVE_INFLIGHT", "64"))
+_INFLIGHT = asyncio.Semaphore(MAX_INFLIGHT)
+_ACTIVE_INFLIGHT = asyncio.Semaphore(MAX_ACTIVE_INFLIGHT)
+
+# Concurrent requests a single fan-out call (one batch or one set of event
+# pages) may have in flight, so one large call can't flood the Umami host.
+FANOUT_PER_CALL = 20
+
+# Process-wide ceiling on fan-out requests across all calls. Every other tool
+# request runs directly under a tool slot, so by default the fan-out gets the
+# connections the tool slots leave free and the total in flight never exceeds
+# MAX_CONNECTIONS.
+MAX_FANOUT = int(
+    os.getenv("UMAMI_MAX_FANOUT")
+    or max(MAX_CONNECTIONS - MAX_INFLIGHT - MAX_ACTIVE_INFLIGHT, 1)
+)
+_FANOUT = asyncio.Semaphore(MAX_FANOUT)
+
+# The Umami events endpoint may only serve the first 1000 matching events (see
+# get_session_ids). Pagination still follows the reported count, so servers
+# without that cap return everything.
+EVENTS_PAGE_SIZE = 200
+
+# Results of the potentially large tools are truncated to fit this many bytes
+_RESPONSE_SIZE_THRESHOLD = 64 * 1024
+_TRUNCATED_NOTE = (
+    "Result truncated to the leading items that fit the response size limit. "
+    "Narrow the date range, use a coarser unit or filter further to see the rest."
+)
+
+# Inputs that are checked before any request is made
+_VALID_EVENTS = frozenset(
+    {
+        "product_details_viewed",
+        "product_clicked",
+        "user_sign_in",
+        "product_added_to_cart",
+        "checkout_started",
+        "language_changed",
+        "checkout_completed",
+    }
+)
+# Metric types accepted by the Umami metrics endpoint
+_VALID_METRIC_TYPES = frozenset(
+    {
+        "url",
+        "entry",
+        "exit",
+        "title",
+        "query",
+        "referrer",
+        "channel",
+        "host",
+        "browser",
+        "os",
+        "device",
+        "screen",
+        "language",
+        "country",
+        "region",
+        "city",
+        "event",
+        "tag",
+    }
+)
+
+
+def _dump(obj) -> str:
+    """Serialize a tool result to compact JSON."""
+    return orjson.dumps(obj).decode()
+
+
+def _dump_limited(obj) -> str:
+    """
+    Serialize a tool result, truncating it to fit _RESPONSE_SIZE_THRESHOLD.
+
+    An oversized list keeps its leading items and is wrapped as
+    {"data": [...], "truncated": true, "total": n, "note": ...}. An oversized
+    dict of lists (such as a pageview series) keeps the same number of leading
+    items in each list and gains the truncated, total and note keys. Anything
+    else is returned whole.
+
+    Args:
+    obj: The tool result to serialize
+
+    Returns:
+    str: Compact JSON no larger than the threshold where it could be truncated
+    """
+    body = _dump(obj)
+    if len(body) <= _RESPONSE_SIZE_THRESHOLD:
+        return body
+
+    if isinstance(obj, list):
+        longest = len(obj)
+
+        def build(n):
+            return {
+                "data": obj[:n],
+                "truncated": True,
+                "total": len(obj),
+                "note": _TRUNCATED_NOTE,
+            }
+
+    elif isinstance(obj, dict) and any(isinstance(v, list) for v in obj.values()):
+        totals = {k: len(v) for k, v in obj.items() if isinstance(v, list)}
+        longest = max(totals.values())
+
+        def build(n):
+            kept = {k: v[:n] if isinstance(v, list) else v for k, v in obj.items()}
+            return {**kept, "truncated": True, "total": totals, "note": _TRUNCATED_NOTE}
+
+    else:
+        return body
+
+    # Binary search for the most leading items that still fit
+    low, high = 0, longest
+    while low < high:
+        mid = (low + high + 1) // 2
+        if len(_dump(build(mid))) <= _RESPONSE_SIZE_THRESHOLD:
+            low = mid
+        else:
+            high = mid - 1
+    return _dump(build(low))
+
+
+def _error_response(tool: str, err, error: str | None = None) -> str:
+    """
+    Log a failed tool call and build the JSON error envelope returned for it.
+
+    Args:
+    tool (str): Name of the tool that failed
+    err (Exception | str): The error or a description of it
+    error (str): Machine-readable error code. Defaults to invalid_argument for a
+        ValueError (bad dates from convert_date_to_unix) and fetch_failed otherwise.
+
+    Returns:
+    str: JSON object with error, tool and detail fields
+    """
+    if error is None:
+        error = "invalid_argument" if isinstance(err, ValueError) else "fetch_failed"
+    detail = str(err)
+    logger.error("%s error: %s", tool, detail)
+    return _dump({"error": error, "tool": tool, "detail": detail})
+
 
-def _get_session_ids(website_id, event_name, start_at, end_at):
+def _result(tool: str, data, dump=_dump) -> str:
+    """
+    Serialize a UmamiClient result, reporting a failed request as fetch_failed.
+
+    The client logs upstream errors and returns None rather than raising.
+
+    Args:
+    tool (str): Name of the tool the result belongs to
+    data: The value returned by the client
+    dump: Serializer for a successful result
+
+    Returns:
+    str: The JSON result or error envelope
+    """
+    if data is None:
+        return _error_response(tool, "Umami API request failed", "fetch_failed")
+    return dump(data)
+
+
+async def _iter_session_ids(
+    website_id, event_name, start_at, end_at
+) -> AsyncIterator[str]:
+    """
+    Yield unique session IDs for a specific event on a website as pages arrive.
+
+    The first page is fetched to learn the total event count, then the
+    remaining pages, up to the reported count, are requested concurrently and
+    yielded in completion order, at most FANOUT_PER_CALL at a time.
+
+    Args:
+    website_id (str): ID of the website
+    event_name (str): Name of the event to filter by
+
+    Yields:
+    str: Each session ID associated with the event, once
+    """
+    per_call = asyncio.Semaphore(FANOUT_PER_CALL)
+
+    async def fetch_page(page):
+        async with per_call, _FANOUT:
+            return await client.get_events_where(
+                website_id=website_id,
+                start_at=start_at,
+                end_at=end_at,
+                unit="day",
+                timezone="UTC",
+                query=event_name,
+                page=page,
+                page_size=EVENTS_PAGE_SIZE,
+            )
+
+    seen: set[str] = set()
+
+    def new_ids(events_where):
+        if events_where is None:
+            raise RuntimeError("Failed to fetch events from Umami API")
+        for event in events_where["data"]:
+            session_id = event["sessionId"]
+            if session_id not in seen:
+                seen.add(session_id)
+                yield session_id
+
+    first = await fetch_page(1)
+    for session_id in new_ids(first):
+        yield session_id
+
+    total_pages = (first["count"] + EVENTS_PAGE_SIZE - 1) // EVENTS_PAGE_SIZE
+    tasks = [asyncio.ensure_future(fetch_page(p)) for p in range(2, total_pages + 1)]
+    try:
+        for next_page in asyncio.as_completed(tasks):
+            for session_id in new_ids(await next_page):
+                yield session_id
+    finally:
+        # Don't leave page requests running if the caller stops early
+        for task in tasks:
+            task.cancel()
+
+
+async def _get_session_ids(website_id, event_name, start_at, end_at):
     """
     Retrieve session IDs for a specific event on a website.
 
@@ -64,50 +354,41 @@ def _get_session_ids(website_id, event_name, start_at, end_at):
     Returns:
     list: Unique session IDs associated with the event
     """
-    ids = []
-    page = 1
-    while True:
-        events_where = client.get_events_where(
-            website_id=website_id,
-            start_at=start_at,
-            end_at=end_at,
-            unit="day",
-            timezone="UTC",
-            query=event_name,
-            page=page,
-            page_size=200,
+    return [
+        session_id
+        async for session_id in _iter_session_ids(
+            website_id, event_name, start_at, end_at
         )
-        if not events_where:
-            break
-
-        if events_where:
-            db = list({event["sessionId"] for event in events_where["data"]})
-            for i in db:
-                ids.append(i)
-        if 200 * events_where["page"] >= events_where["count"]:
-            break
-        else:
-            page += 1
-    return list(set(ids))
+    ]
 
 
-@mcp.prompt()
-async def create_dashboard(
-    website_name: str,
-    start_date: str,
-    end_date: str,
-    timezone: str,
-):
-    """Guide for creating comprehensive analytics dashboards using website metrics and stats
+async def _get_user_activities(website_id, session_ids, start_at, end_at):
+    """
+    Retrieve user activity for several sessions concurrently, at most
+    FANOUT_PER_CALL at a time and within the shared _FANOUT ceiling.
 
     Args:
-    - website_name: Name of the website to analyze
-    - start_date: Start date for analysis (YYYY-MM-DD or YYYY-MM-DD HH:MM:SS)
-    - end_date: End date for analysis (YYYY-MM-DD or YYYY-MM-DD HH:MM:SS)
-    - timezone: Timezone for the analysis (e.g., 'UTC', 'Europe/London')
+    website_id (str): ID of the website
+    session_ids (list): IDs of the sessions to fetch activity for
 
+    Returns:
+    dict: Activity data keyed by session ID
     """
-    content = f"""You are an analytics expert helping to create a comprehensive dashboard using website tracking data. 
+    per_call = asyncio.Semaphore(FANOUT_PER_CALL)
+
+    async def one(session_id):
+        async with per_call, _FANOUT:
+            return session_id, await client.get_user_activity(
+                website_id=website_id,
+                session_id=session_id,
+                start_at=start_at,
+                end_at=end_at,
+            )
+
+    return dict(await asyncio.gather(*(one(sid) for sid in session_ids)))
+
+
+_DASHBOARD_TEMPLATE = """You are an analytics expert helping to create a comprehensive dashboard using website tracking data. 
 Follow these steps to create an attractive and engaging dashboard for website: {website_name}, analyzing data from {start_date} to {end_date} in timezone {timezone}.
 To begin, get the website id using get_websites and find the id of the website with the name {website_name}. Then use the id to get the other data.
 
@@ -163,7 +444,7 @@ Use get_active_visitors to:
 5. USER JOURNEY ANALYSIS
 For deeper insights into specific behaviors:
 a) Use get_session_ids to identify relevant user sessions
-b) Use get_tracking_data to analyze specific user journeys
+b) Use get_tracking_data_batch (or get_tracking_data for a single session) to analyze specific user journeys
 c) Use get_docs to find patterns in user behavior
 
 6. VISUAL CONTEXT
@@ -191,6 +472,30 @@ Remember to:
 
 Start by gathering the overview metrics and then proceed through each analysis section systematically. Only create once you are satisfied you have gathered all the data you need.
 Ensure the dashboard is visually appealing and easy to understand."""
+
+
+@mcp.prompt()
+async def create_dashboard(
+    website_name: str,
+    start_date: str,
+    end_date: str,
+    timezone: str,
+):
+    """Guide for creating comprehensive analytics dashboards using website metrics and stats
+
+    Args:
+    - website_name: Name of the website to analyze
+    - start_date: Start date for analysis (YYYY-MM-DD or YYYY-MM-DD HH:MM:SS)
+    - end_date: End date for analysis (YYYY-MM-DD or YYYY-MM-DD HH:MM:SS)
+    - timezone: Timezone for the analysis (e.g., 'UTC', 'Europe/London')
+
+    """
+    content = _DASHBOARD_TEMPLATE.format(
+        website_name=website_name,
+        start_date=start_date,
+        end_date=end_date,
+        timezone=timezone,
+    )
     return PromptMessage(role="user", content=TextContent(type="text", text=content))
 
 
@@ -213,12 +518,12 @@ async def get_websites() -> str:
         - deletedAt: The date and time when the website was deleted
         - createUser: The unique identifier of the user that created the website, and their username
     """
-    try:
-        sites = client.get_websites()
-        return json.dumps(sites, indent=2)
-    except Exception as e:
-        logger.error("get_websites error: %s", e)
-        return f"Error fetching websites: {e}"
+    async with _INFLIGHT:
+        try:
+            sites = await client.get_websites()
+            return _result("get_websites", sites)
+        except Exception as e:
+            return _error_response("get_websites", e)
 
 
 @mcp.tool()
@@ -259,14 +564,18 @@ async def get_session_ids(
             - checkout_completed
             If not filtering by an event, set this to None.
     """
-    try:
-        start_ts = convert_date_to_unix(start_at, end_of_day=False)
-        end_ts = convert_date_to_unix(end_at, end_of_day=True)
-        ids = _get_session_ids(website_id, event_name, start_ts, end_ts)
-        return json.dumps(ids, indent=2)
-    except Exception as e:
-        logger.error("get_session_ids error: %s", e)
-        return f"Error fetching session IDs: {e}"
+    if event_name and event_name not in _VALID_EVENTS:
+        return _error_response(
+            "get_session_ids", f"unknown event name '{event_name}'", "invalid_argument"
+        )
+    async with _INFLIGHT:
+        try:
+            start_ts = convert_date_to_unix(start_at, end_of_day=False)
+            end_ts = convert_date_to_unix(end_at, end_of_day=True)
+            ids = await _get_session_ids(website_id, event_name, start_ts, end_ts)
+            return _dump(ids)
+        except Exception as e:
+            return _error_response("get_session_ids", e)
 
 
 @mcp.tool()
@@ -295,19 +604,63 @@ async def get_tracking_data(
             Note: If time is not provided, 23:59:59.999 will be used
         - session_id (string): ID of the user session to get tracking data for
     """
-    try:
-        start_ts = convert_date_to_unix(start_at, end_of_day=False)
-        end_ts = convert_date_to_unix(end_at, end_of_day=True)
-        data = client.get_user_activity(
-            website_id=website_id,
-            session_id=session_id,
-            start_at=start_ts,
-            end_at=end_ts,
-        )
-        return json.dumps(data, indent=2)
-    except Exception as e:
-        logger.error("get_tracking_data error: %s", e)
-        return f"Error fetching tracking data: {e}"
+    async with _INFLIGHT:
+        try:
+            start_ts = convert_date_to_unix(start_at, end_of_day=False)
+            end_ts = convert_date_to_unix(end_at, end_of_day=True)
+            data = await client.get_user_activity(
+                website_id=website_id,
+                session_id=session_id,
+                start_at=start_ts,
+                end_at=end_ts,
+            )
+            return _result("get_tracking_data", data)
+        except Exception as e:
+            return _error_response("get_tracking_data", e)
+
+
+@mcp.tool()
+async def get_tracking_data_batch(
+    website_id: str,
+    session_ids: list[str],
+    start_at: str,
+    end_at: str,
+) -> str:
+    """Get the user journeys for several session IDs within a time range in a single call.
+    Prefer this over calling get_tracking_data once per session. The result maps each session ID to its tracking data.
+    Sessions whose data could not be fetched map to null; if none could be fetched a fetch_failed error is returned.
+    Note: If no results are returned, do not immediately assume there is no data - verify the unix timestamps are correct and ask the user for specific date ranges if not provided
+
+    Args:
+        - website_id (string): The ID of the website where the user journeys are located
+        - session_ids (list of strings): IDs of the user sessions to get tracking data for
+        - start_at (string): Start date for time range of data to retrieve. Format: YYYY-MM-DD or YYYY-MM-DD HH:MM:SS
+            Examples:
+            - 2024-03-01
+            - 2024-03-01 00:00:00
+            - 2024-01-31
+            Note: If time is not provided, 00:00:00 will be used
+        - end_at (string): End date for time range of data to retrieve. Format: YYYY-MM-DD or YYYY-MM-DD HH:MM:SS
+            Examples:
+            - 2024-03-01
+            - 2024-03-01 23:59:59
+            - 2024-01-31
+            Note: If time is not provided, 23:59:59.999 will be used
+    """
+    async with _INFLIGHT:
+        try:
+            start_ts = convert_date_to_unix(start_at, end_of_day=False)
+            end_ts = convert_date_to_unix(end_at, end_of_day=True)
+            data = await _get_user_activities(website_id, session_ids, start_ts, end_ts)
+            if data and all(activity is None for activity in data.values()):
+                return _error_response(
+                    "get_tracking_data_batch",
+                    "Umami API request failed",
+                    "fetch_failed",
+                )
+            return _dump(data)
+        except Exception as e:
+            return _error_response("get_tracking_data_batch", e)
 
 
 @mcp.tool()
@@ -342,18 +695,18 @@ async def get_website_stats(
             - 2024-01-31
             Note: If time is not provided, 23:59:59.999 will be used
     """
-    try:
-        start_ts = convert_date_to_unix(start_at, end_of_day=False)
-        end_ts = convert_date_to_unix(end_at, end_of_day=True)
-        stats = client.get_website_stats(
-            website_id=website_id,
-            start_at=start_ts,
-            end_at=end_ts,
-        )
-        return json.dumps(stats, indent=2)
-    except Exception as e:
-        logger.error("get_website_stats error: %s", e)
-        return f"Error fetching website stats: {e}"
+    async with _INFLIGHT:
+        try:
+            start_ts = convert_date_to_unix(start_at, end_of_day=False)
+            end_ts = convert_date_to_unix(end_at, end_of_day=True)
+            stats = await client.get_website_stats(
+                website_id=website_id,
+                start_at=start_ts,
+                end_at=end_ts,
+            )
+            return _result("get_website_stats", stats)
+        except Exception as e:
+            return _error_response("get_website_stats", e)
 
 
 @mcp.tool()
@@ -365,6 +718,7 @@ async def get_website_metrics(
 ) -> str:
     """Get various metrics for a specific website within a time range and how many visitors have had each metric.
     The metric type is selected by type property.
+    Results over 64 KiB are truncated to the leading items and marked with "truncated": true.
 
     Note: If no results are returned, do not immediately assume there is no data - verify the unix timestamps are correct and ask the user for specific date ranges if not provided.
 
@@ -384,26 +738,41 @@ async def get_website_metrics(
             Note: If time is not provided, 23:59:59.999 will be used
         - type (string): Type of metrics to retrieve. Here are the possible types:
             - url: The number of visits for each URL on the website (effectively the number times each page has been visited)
+            - entry: The pages visitors landed on first
+            - exit: The pages visitors left the website from
+            - title: The number of visits for each page title
+            - query: The query strings of the visited URLs
             - referrer: Where the visitors came from to get to the website
+            - channel: The kind of traffic source (e.g. direct, organic search, social)
+            - host: Which hostname of the website was visited
             - browser: Which browser the visitors used to visit the website
             - os: Which operating system the visitors used to visit the website
             - device: Which device the visitors used to visit the website
+            - screen: Which screen resolution the visitors used
+            - language: Which language the visitors' browsers are set to
             - country: Which country the visitors are from
+            - region: Which region the visitors are from
+            - city: Which city the visitors are from
             - event: The tally of each event that has occurred on the website
+            - tag: The tag of each event that has occurred on the website
     """
-    try:
-        start_ts = convert_date_to_unix(start_at, end_of_day=False)
-        end_ts = convert_date_to_unix(end_at, end_of_day=True)
-        metrics = client.get_website_metrics(
-            website_id=website_id,
-            start_at=start_ts,
-            end_at=end_ts,
-            type=type,
+    if type not in _VALID_METRIC_TYPES:
+        return _error_response(
+            "get_website_metrics", f"unknown metric type '{type}'", "invalid_argument"
         )
-        return json.dumps(metrics, indent=2)
-    except Exception as e:
-        logger.error("get_website_metrics error: %s", e)
-        return f"Error fetching website metrics: {e}"
+    async with _INFLIGHT:
+        try:
+            start_ts = convert_date_to_unix(start_at, end_of_day=False)
+            end_ts = convert_date_to_unix(end_at, end_of_day=True)
+            metrics = await client.get_website_metrics(
+                website_id=website_id,
+                start_at=start_ts,
+                end_at=end_ts,
+                type=type,
+            )
+            return _result("get_website_metrics", metrics, _dump_limited)
+        except Exception as e:
+            return _error_response("get_website_metrics", e)
 
 
 # @mcp.tool()
@@ -450,29 +819,20 @@ async def get_website_metrics(
 #         start_ts = convert_date_to_unix(start_at, end_of_day=False)
 #         end_ts = convert_date_to_unix(end_at, end_of_day=True)
 #         # fetch sessions
-#         sessions = _get_session_ids(
+#         sessions = await _get_session_ids(
 #             website_id,
 #             None if selected_event in (None, "None") else selected_event,
 #             start_ts,
 #             end_ts,
 #         )
 #         # gather activity json strings
-#         activities = []
-#         for sid in sessions:
-#             act = client.get_user_activity(
-#                 website_id=website_id,
-#                 session_id=sid,
-#                 start_at=start_ts,
-#                 end_at=end_ts,
-#             )
-#             if act:
-#                 activities.append(json.dumps(act, indent=2))
+#         activity = await _get_user_activities(website_id, sessions, start_ts, end_ts)
+#         activities = [_dump(act) for act in activity.values() if act]
 #         # chunk & embed
 #         docs = await get_chunks(activities, user_question)
 #         return "\n\n".join(d.page_content for d in docs)
 #     except Exception as e:
-#         logger.error("get_docs error: %s", e)
-#         return f"Error building docs: {e}"
+#         return _error_response("get_docs", e)
 
 
 @mcp.tool()
@@ -486,6 +846,7 @@ async def get_pageview_series(
     """Get the pageview data series for a specific website within a time range.
     The data is grouped by the specified time unit (hour, day, month) and includes the number
     of pageviews and sessions for each time period.
+    Results over 64 KiB are truncated to the leading periods and marked with "truncated": true; use a coarser unit to see the whole range.
 
     Note: If no results are returned, do not immediately assume there is no data - verify the unix timestamps are correct and ask the user for specific date ranges if not provided.
 
@@ -506,20 +867,20 @@ async def get_pageview_series(
         - unit (string): Time unit for grouping data (hour, day, or month)
         - timezone (string): Timezone for the data (e.g., 'UTC', 'Europe/London')
     """
-    try:
-        start_ts = convert_date_to_unix(start_at, end_of_day=False)
-        end_ts = convert_date_to_unix(end_at, end_of_day=True)
-        series = client.get_pageview_series(
-            website_id=website_id,
-            start_at=start_ts,
-            end_at=end_ts,
-            unit=unit,
-            timezone=timezone,
-        )
-        return json.dumps(series, indent=2)
-    except Exception as e:
-        logger.error("get_pageview_series error: %s", e)
-        return f"Error fetching pageview series: {e}"
+    async with _INFLIGHT:
+        try:
+            start_ts = convert_date_to_unix(start_at, end_of_day=False)
+            end_ts = convert_date_to_unix(end_at, end_of_day=True)
+            series = await client.get_pageview_series(
+                website_id=website_id,
+                start_at=start_ts,
+                end_at=end_ts,
+                unit=unit,
+                timezone=timezone,
+            )
+            return _result("get_pageview_series", series, _dump_limited)
+        except Exception as e:
+            return _error_response("get_pageview_series", e)
 
 
 @mcp.tool()
@@ -530,12 +891,12 @@ async def get_active_visitors(website_id: str) -> str:
     Args
         - website_id (string): ID of the website to get active visitor data for
     """
-    try:
-        data = client.get_active(website_id)
-        return json.dumps(data, indent=2)
-    except Exception as e:
-        logger.error("get_active_visitors error: %s", e)
-        return f"Error fetching active visitors: {e}"
+    async with _ACTIVE_INFLIGHT:
+        try:
+            data = await client.get_active(website_id)
+            return _result("get_active_visitors", data)
+        except Exception as e:
+            return _error_response("get_active_visitors", e)
 
 
 if __name__ == "__main__":
@@ -1,10 +1,18 @@
-from datetime import datetime
+import calendar
+import re
+from functools import lru_cache
 
+# YYYY-MM-DD with an optional HH:MM:SS, separated by a space or "T"
+_DATE_RE = re.compile(
+    r"(\d{4})-(\d{2})-(\d{2})(?:[ T](\d{2}):(\d{2}):(\d{2}))?", re.ASCII
+)
 
+
+@lru_cache(maxsize=512)
 def convert_date_to_unix(date_str: str, end_of_day: bool = False) -> int:
     """
     Convert a date string to Unix timestamp in milliseconds.
-    Format should be YYYY-MM-DD or YYYY-MM-DD HH:MM:SS
+    Format should be YYYY-MM-DD or YYYY-MM-DD HH:MM:SS, interpreted as UTC.
 
     Args:
         date_str (str): Date string in format YYYY-MM-DD or YYYY-MM-DD HH:MM:SS
@@ -14,18 +22,29 @@ def convert_date_to_unix(date_str: str, end_of_day: bool = False) -> int:
         int: Unix timestamp in milliseconds
     """
     try:
-        # Try parsing with time first
-        try:
-            dt = datetime.strptime(date_str, "%Y-%m-%d %H:%M:%S")
-        except ValueError:
-            # If that fails, try just date
-            dt = datetime.strptime(date_str, "%Y-%m-%d")
-            # If end_of_day is True, set time to end of day
-            if end_of_day:
-                dt = dt.replace(hour=23, minute=59, second=59, microsecond=999000)
-
-        # Convert to milliseconds
-        return int(dt.timestamp() * 1000)
+        match = _DATE_RE.fullmatch(date_str)
+        if not match:
+            raise ValueError(f"unrecognised date '{date_str}'")
+        groups = match.groups()
+        year, month, day = int(groups[0]), int(groups[1]), int(groups[2])
+
+        if groups[3] is not None:
+            hour, minute, second = int(groups[3]), int(groups[4]), int(groups[5])
+            ms = 0
+        elif end_of_day:
+            hour, minute, second, ms = 23, 59, 59, 999
+        else:
+            hour = minute = second = ms = 0
+
+        # Range-check the fields by hand: timegm would silently roll them over
+        _, days_in_month = calendar.monthrange(year, month)
+        if not 1 <= day <= days_in_month:
+            raise ValueError(f"day is out of range for month in '{date_str}'")
+        if hour > 23 or minute > 59 or second > 59:
+            raise ValueError(f"time is out of range in '{date_str}'")
+
+        # timegm treats the fields as UTC, independent of the server's TZ
+        return calendar.timegm((year, month, day, hour, minute, second)) * 1000 + ms
     except ValueError as e:
         raise ValueError(
             f"Invalid date format. Please use YYYY-MM-DD or YYYY-MM-DD HH:MM:SS. Error: {str(e)}"
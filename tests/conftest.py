@@ -0,0 +1,4 @@
+import os
+
+# server.py reads its credentials at import time
+os.environ.setdefault("UMAMI_API_KEY", "test-key")
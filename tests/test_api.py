@@ -0,0 +1,116 @@
+import asyncio
+
+import httpx
+
+from analytics_service import api
+from analytics_service.api import UmamiClient
+
+
+def make_client(handler):
+    transport = httpx.MockTransport(handler)
+    return UmamiClient(
+        "https://umami.test/api", client=httpx.AsyncClient(transport=transport)
+    )
+
+
+def counting_handler(calls, status_code=200):
+    def handler(request):
+        calls.append(request.url.path)
+        return httpx.Response(status_code, json={"pageviews": {"value": 1}})
+
+    return handler
+
+
+def test_cache_serves_repeat_calls():
+    calls = []
+    client = make_client(counting_handler(calls))
+
+    async def run():
+        first = await client.get_website_stats(website_id="w", start_at=0, end_at=1)
+        second = await client.get_website_stats(website_id="w", start_at=0, end_at=1)
+        other = await client.get_website_stats(website_id="w", start_at=0, end_at=2)
+        return first, second, other
+
+    first, second, other = asyncio.run(run())
+    assert first == second == other
+    assert len(calls) == 2
+
+
+def test_failed_requests_are_not_cached():
+    calls = []
+    client = make_client(counting_handler(calls, status_code=500))
+
+    async def run():
+        for _ in range(2):
+            stats = await client.get_website_stats(website_id="w", start_at=0, end_at=1)
+            assert stats is None
+
+    asyncio.run(run())
+    assert len(calls) == 2
+
+
+def test_expired_entry_is_refetched(monkeypatch):
+    calls = []
+    client = make_client(counting_handler(calls))
+    now = [1000.0]
+    monkeypatch.setattr(api.time, "monotonic", lambda: now[0])
+
+    async def run():
+        await client.get_website_stats(website_id="w", start_at=0, end_at=1)
+        now[0] += 61
+        await client.get_website_stats(website_id="w", start_at=0, end_at=1)
+
+    asyncio.run(run())
+    assert len(calls) == 2
+    assert len(client._caches["get_website_stats"]) == 1
+
+
+def test_full_cache_sweeps_expired_entries(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(api.time, "monotonic", lambda: now[0])
+
+    class SmallCacheClient(UmamiClient):
+        @api._ttl_cache(ttl=10, maxsize=2)
+        async def lookup(self, key):
+            return {"key": key}
+
+    client = SmallCacheClient("https://umami.test/api")
+
+    async def run():
+        await client.lookup(key=1)
+        now[0] += 5
+        await client.lookup(key=2)
+        now[0] += 6
+        # key 1 has expired and is swept; key 2 is still live and kept
+        await client.lookup(key=3)
+
+    asyncio.run(run())
+    assert list(client._caches["lookup"]) == [
+        ((), (("key", 2),)),
+        ((), (("key", 3),)),
+    ]
+
+
+def test_caches_are_per_instance():
+    calls = []
+    handler = counting_handler(calls)
+    first, second = make_client(handler), make_client(handler)
+
+    async def run():
+        await first.get_website_stats(website_id="w", start_at=0, end_at=1)
+        await second.get_website_stats(website_id="w", start_at=0, end_at=1)
+
+    asyncio.run(run())
+    assert len(calls) == 2
+
+
+def test_active_visitors_are_not_cached():
+    calls = []
+    client = make_client(counting_handler(calls))
+
+    async def run():
+        await client.get_active("w")
+        await client.get_active("w")
+
+    asyncio.run(run())
+    assert len(calls) == 2
@@ -0,0 +1,275 @@
+import asyncio
+import json
+
+import pytest
+
+from analytics_service import server
+
+
+def events_page(page, count, page_size=server.EVENTS_PAGE_SIZE):
+    start = (page - 1) * page_size
+    stop = min(start + page_size, count)
+    # Two events per session, so every page repeats half its session IDs
+    return {
+        "count": count,
+        "page": page,
+        "data": [{"sessionId": f"s{i // 2}"} for i in range(start, stop)],
+    }
+
+
+@pytest.fixture
+def fake_events(monkeypatch):
+    requested = []
+
+    def install(count, fail_pages=()):
+        async def get_events_where(**kwargs):
+            page = kwargs["page"]
+            requested.append(page)
+            if page in fail_pages:
+                return None
+            return events_page(page, count)
+
+        monkeypatch.setattr(server.client, "get_events_where", get_events_where)
+        return requested
+
+    return install
+
+
+@pytest.mark.parametrize(
+    "count, pages",
+    [(0, [1]), (150, [1]), (200, [1]), (201, [1, 2]), (1000, [1, 2, 3, 4, 5])],
+)
+def test_pagination_requests_each_page_once(fake_events, count, pages):
+    requested = fake_events(count)
+    ids = asyncio.run(server._get_session_ids("w", None, 0, 1))
+    assert sorted(requested) == pages
+    assert sorted(ids) == sorted({f"s{i // 2}" for i in range(count)})
+
+
+def test_pagination_follows_count_past_1000(fake_events):
+    requested = fake_events(1401)
+    ids = asyncio.run(server._get_session_ids("w", None, 0, 1))
+    assert sorted(requested) == list(range(1, 9))
+    assert len(ids) == 701
+
+
+def test_get_session_ids_reports_failed_page(fake_events):
+    fake_events(600, fail_pages={2})
+    result = json.loads(
+        asyncio.run(server.get_session_ids("w", "2024-03-01", "2024-03-02"))
+    )
+    assert result["error"] == "fetch_failed"
+    assert result["tool"] == "get_session_ids"
+
+
+def test_get_session_ids_rejects_unknown_event(fake_events):
+    requested = fake_events(10)
+    result = json.loads(
+        asyncio.run(
+            server.get_session_ids("w", "2024-03-01", "2024-03-02", "checkout_done")
+        )
+    )
+    assert result["error"] == "invalid_argument"
+    assert requested == []
+
+
+def test_get_website_metrics_rejects_unknown_type():
+    result = json.loads(
+        asyncio.run(
+            server.get_website_metrics("w", "2024-03-01", "2024-03-02", "colour")
+        )
+    )
+    assert result["error"] == "invalid_argument"
+
+
+@pytest.mark.parametrize("type", ["entry", "exit", "tag", "channel"])
+def test_get_website_metrics_accepts_upstream_types(monkeypatch, type):
+    async def get_website_metrics(**kwargs):
+        return [{"x": kwargs["type"], "y": 1}]
+
+    monkeypatch.setattr(server.client, "get_website_metrics", get_website_metrics)
+    result = json.loads(
+        asyncio.run(server.get_website_metrics("w", "2024-03-01", "2024-03-02", type))
+    )
+    assert result == [{"x": type, "y": 1}]
+
+
+def test_metric_types_match_the_docstring():
+    documented = {
+        line.strip()[2:].split(":")[0]
+        for line in server.get_website_metrics.__doc__.split("possible types:")[1]
+        .strip()
+        .splitlines()
+    }
+    assert documented == server._VALID_METRIC_TYPES
+
+
+def test_bad_date_is_invalid_argument():
+    result = json.loads(
+        asyncio.run(server.get_website_stats("w", "2024-02-30", "2024-03-02"))
+    )
+    assert result["error"] == "invalid_argument"
+    assert result["tool"] == "get_website_stats"
+
+
+def test_upstream_failure_is_fetch_failed(monkeypatch):
+    async def get_website_stats(**kwargs):
+        return None
+
+    monkeypatch.setattr(server.client, "get_website_stats", get_website_stats)
+    result = json.loads(
+        asyncio.run(server.get_website_stats("w", "2024-03-01", "2024-03-02"))
+    )
+    assert result["error"] == "fetch_failed"
+
+
+def test_tracking_data_batch(monkeypatch):
+    requested = []
+
+    async def get_user_activity(**kwargs):
+        requested.append(kwargs["session_id"])
+        await asyncio.sleep(0)
+        if kwargs["session_id"] == "bad":
+            return None
+        return [{"sessionId": kwargs["session_id"]}]
+
+    monkeypatch.setattr(server.client, "get_user_activity", get_user_activity)
+    result = json.loads(
+        asyncio.run(
+            server.get_tracking_data_batch(
+                "w", ["a", "b", "bad"], "2024-03-01", "2024-03-02"
+            )
+        )
+    )
+    assert result == {
+        "a": [{"sessionId": "a"}],
+        "b": [{"sessionId": "b"}],
+        "bad": None,
+    }
+    assert sorted(requested) == ["a", "b", "bad"]
+
+
+def test_tracking_data_batch_caps_concurrency_per_call(monkeypatch):
+    in_flight = [0, 0]
+
+    async def get_user_activity(**kwargs):
+        in_flight[0] += 1
+        in_flight[1] = max(in_flight)
+        await asyncio.sleep(0.001)
+        in_flight[0] -= 1
+        return []
+
+    monkeypatch.setattr(server.client, "get_user_activity", get_user_activity)
+    session_ids = [f"s{i}" for i in range(100)]
+    result = json.loads(
+        asyncio.run(
+            server.get_tracking_data_batch("w", session_ids, "2024-03-01", "2024-03-02")
+        )
+    )
+    assert len(result) == 100
+    assert in_flight[1] == server.FANOUT_PER_CALL
+
+
+def test_tracking_data_batch_all_failed(monkeypatch):
+    async def get_user_activity(**kwargs):
+        return None
+
+    monkeypatch.setattr(server.client, "get_user_activity", get_user_activity)
+    result = json.loads(
+        asyncio.run(
+            server.get_tracking_data_batch("w", ["a", "b"], "2024-03-01", "2024-03-02")
+        )
+    )
+    assert result["error"] == "fetch_failed"
+
+
+def test_small_metrics_are_returned_whole(monkeypatch):
+    metrics = [{"x": "/", "y": 1}]
+
+    async def get_website_metrics(**kwargs):
+        return metrics
+
+    monkeypatch.setattr(server.client, "get_website_metrics", get_website_metrics)
+    result = json.loads(
+        asyncio.run(server.get_website_metrics("w", "2024-03-01", "2024-03-02", "url"))
+    )
+    assert result == metrics
+
+
+def test_large_metrics_are_truncated(monkeypatch):
+    metrics = [{"x": f"/page/{i}", "y": i} for i in range(10000)]
+
+    async def get_website_metrics(**kwargs):
+        return metrics
+
+    monkeypatch.setattr(server.client, "get_website_metrics", get_website_metrics)
+    body = asyncio.run(
+        server.get_website_metrics("w", "2024-03-01", "2024-03-02", "url")
+    )
+    assert len(body) <= server._RESPONSE_SIZE_THRESHOLD
+    result = json.loads(body)
+    assert result["truncated"] is True
+    assert result["total"] == 10000
+    assert 0 < len(result["data"]) < 10000
+    assert result["data"] == metrics[: len(result["data"])]
+
+
+def test_large_pageview_series_keeps_leading_periods(monkeypatch):
+    series = {
+        "pageviews": [{"x": f"2024-01-01 {i:05d}", "y": i} for i in range(5000)],
+        "sessions": [{"x": f"2024-01-01 {i:05d}", "y": i} for i in range(5000)],
+    }
+
+    async def get_pageview_series(**kwargs):
+        return series
+
+    monkeypatch.setattr(server.client, "get_pageview_series", get_pageview_series)
+    body = asyncio.run(
+        server.get_pageview_series("w", "2024-03-01", "2024-03-02", "hour", "UTC")
+    )
+    assert len(body) <= server._RESPONSE_SIZE_THRESHOLD
+    result = json.loads(body)
+    assert result["truncated"] is True
+    assert result["total"] == {"pageviews": 5000, "sessions": 5000}
+    kept = len(result["pageviews"])
+    assert 0 < kept < 5000
+    assert result["sessions"] == series["sessions"][:kept]
+
+
+def test_lifespan_leaves_shared_client_open():
+    async def run():
+        # One lifespan per session on the SSE and streamable HTTP transports
+        for _ in range(2):
+            async with server.lifespan(server.mcp):
+                pass
+
+    asyncio.run(run())
+    assert not server.httpx_client.is_closed
+
+
+def test_password_login_happens_once_per_process(monkeypatch):
+    logins = []
+
+    async def login(username, password):
+        logins.append(username)
+        server.client.token = "token"
+        return True
+
+    monkeypatch.setattr(server, "API_KEY", None)
+    monkeypatch.setattr(server, "API_USERNAME", "user")
+    monkeypatch.setattr(server, "API_PASSWORD", "secret")
+    monkeypatch.setattr(server, "_refresh_task", None)
+    monkeypatch.setattr(server.client, "token", None)
+    monkeypatch.setattr(server.client, "login", login)
+
+    async def run():
+        for _ in range(3):
+            async with server.lifespan(server.mcp):
+                pass
+        refresh_task = server._refresh_task
+        # The refresh outlives the sessions that have ended
+        assert not refresh_task.done()
+        refresh_task.cancel()
+
+    asyncio.run(run())
+    assert logins == ["user"]
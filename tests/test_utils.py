@@ -0,0 +1,64 @@
+import time
+
+import pytest
+
+from analytics_service.utils import convert_date_to_unix
+
+
+@pytest.fixture(autouse=True, params=["UTC", "America/New_York"])
+def server_tz(request, monkeypatch):
+    """Run every test under several server timezones; results must not change."""
+    monkeypatch.setenv("TZ", request.param)
+    time.tzset()
+    convert_date_to_unix.cache_clear()
+    yield request.param
+    monkeypatch.undo()
+    time.tzset()
+    convert_date_to_unix.cache_clear()
+
+
+def test_date_only_is_start_of_day_utc():
+    assert convert_date_to_unix("2024-03-01") == 1709251200000
+
+
+def test_date_only_end_of_day():
+    assert convert_date_to_unix("2024-03-01", end_of_day=True) == 1709337599999
+
+
+def test_date_and_time():
+    assert convert_date_to_unix("2024-03-01 10:00:00") == 1709287200000
+
+
+def test_explicit_time_ignores_end_of_day():
+    assert convert_date_to_unix("2024-03-01 10:00:00", end_of_day=True) == 1709287200000
+
+
+def test_t_separator():
+    assert convert_date_to_unix("2024-03-01T10:00:00") == convert_date_to_unix(
+        "2024-03-01 10:00:00"
+    )
+
+
+def test_leap_day():
+    assert convert_date_to_unix("2024-02-29") == 1709164800000
+
+
+@pytest.mark.parametrize(
+    "date_str",
+    [
+        "2024-02-30",
+        "2023-02-29",
+        "2024-13-01",
+        "2024-00-10",
+        "2024-03-00",
+        "2024-03-01 24:00:00",
+        "2024-03-01 10:60:00",
+        "2024-03-01 10:00",
+        "2024/03/01",
+        "2024-03-01\n",
+        "",
+    ],
+)
+def test_invalid_dates(date_str):
+    with pytest.raises(ValueError, match="Invalid date format"):
+        convert_date_to_unix(date_str)